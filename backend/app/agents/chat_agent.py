@@ -14,6 +14,7 @@ except Exception:
 
 from app.agents.crisis_detector import detect_crisis
 from app.agents.wellness_agent import breathing_card
+from app.agents.turn_cache import SpeculativeTurnCache, state_key
 
 # ----------------------------
 # Config
@@ -23,6 +24,14 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
 PERSONA_ORDER = ["CBT", "Holistic", "Analytical"]
 
+# Speculative generation of the next debate turn (set SPECULATIVE_TURNS=0 to disable)
+SPECULATIVE_TURNS = os.getenv("SPECULATIVE_TURNS", "1") not in ("0", "false", "False", "")
+_speculative = SpeculativeTurnCache(
+    max_entries=int(os.getenv("SPECULATIVE_MAX_ENTRIES", "64")),
+    ttl_seconds=float(os.getenv("SPECULATIVE_TTL_SECONDS", "120")),
+    workers=int(os.getenv("SPECULATIVE_WORKERS", "4")),
+)
+
 # Short, consistent system prompts per persona
 PERSONA_SYSTEM = {
     "CBT": """You are Dr. Sarah Chen, an evidence-based CBT therapist.
@@ -197,9 +206,57 @@ def _crisis_frontline_message(user_message: str) -> Dict[str, Any]:
     }
 
 
-def orchestrate_turn(topic: str, history: List[Dict[str, Any]], user_message: str) -> Dict[str, Any]:
+def _next_persona(messages: List[Dict[str, Any]]) -> str:
+    """Next speaker when nobody interjects: rotate through PERSONA_ORDER after the last persona."""
+    for m in reversed(messages):
+        if m.get("role") != "user" and m.get("name") in PERSONA_ORDER:
+            return PERSONA_ORDER[(PERSONA_ORDER.index(m["name"]) + 1) % len(PERSONA_ORDER)]
+    return PERSONA_ORDER[0]
+
+def _round_done(messages: List[Dict[str, Any]]) -> bool:
+    """A debate round is one turn per persona since the opening or the user's last message."""
+    turns = 0
+    for m in reversed(messages):
+        if m.get("role") == "user":
+            break
+        if m.get("name") in PERSONA_ORDER:
+            turns += 1
+    return turns >= len(PERSONA_ORDER)
+
+def _persona_turn(persona: str, topic: str, messages: List[Dict[str, Any]], user_message: str) -> Dict[str, Any]:
+    """Generate one persona message for the given conversation state."""
+    opening = not any(m.get("role") != "user" for m in messages)
+    content = _persona_message(
+        client=_client(),
+        persona=persona,
+        topic=topic,
+        chat_context=_to_chat_history(messages),
+        user_message=user_message,
+        opening=opening
+    )
+    return {
+        "role": "assistant",
+        "name": persona,
+        "content": content,
+        "ts": _ts(),
+        "typing_ms": _typing_ms_for(persona),
+    }
+
+def speculation_stats() -> Dict[str, int]:
+    return _speculative.stats()
+
+
+def orchestrate_turn(
+    topic: str,
+    history: List[Dict[str, Any]],
+    user_message: str,
+    debate: bool = False,
+    session_id: str = ""
+) -> Dict[str, Any]:
     """
     Returns one therapist response at a time, chosen based on the psychology of the user's message.
+    In debate mode, continuations (empty user_message) rotate through the personas, and the
+    next turn of the current round is pre-generated in the background for `session_id`.
     """
     messages = list(history)
     extras: List[Dict[str, Any]] = []
@@ -210,7 +267,7 @@ def orchestrate_turn(topic: str, history: List[Dict[str, Any]], user_message: st
 
     # Crisis / wellness
     if user_message and detect_crisis(user_message):
-        messages.append(_crisis_frontline_message())
+        messages.append(_crisis_frontline_message(user_message))
         extras.append(_crisis_extras_block())
 
     elif user_message and any(x in user_message.lower() for x in [
@@ -229,32 +286,32 @@ def orchestrate_turn(topic: str, history: List[Dict[str, Any]], user_message: st
             return "Analytical"
         return "CBT"  # default safe fallback
 
-    chosen_persona = choose_persona(user_message or "")
-
-    # Build context
-    client = _client()
-    chat_context = _to_chat_history(messages)
-
-    opening = not any(m.get("role") != "user" for m in messages)
-
-    # Generate response for chosen persona only
-    content = _persona_message(
-        client=client,
-        persona=chosen_persona,
-        topic=topic,
-        chat_context=chat_context,
-        user_message=user_message or "",
-        opening=opening
-    )
-
-    msg = {
-        "role": "assistant",
-        "name": chosen_persona,
-        "content": content,
-        "ts": _ts(),
-        "typing_ms": _typing_ms_for(chosen_persona),
-    }
+    # In a debate, continuations move on to the next persona
+    if debate and not user_message:
+        chosen_persona = _next_persona(messages)
+    else:
+        chosen_persona = choose_persona(user_message or "")
+
+    speculative = debate and SPECULATIVE_TURNS and bool(session_id)
+    msg = None
+    if speculative and user_message:
+        _speculative.discard(session_id)  # user interjected; pre-generated turns are stale
+    elif speculative and any(m.get("role") != "user" for m in history):
+        msg = _speculative.take(state_key(session_id, topic, history))
+
+    if msg is not None:
+        msg = {**msg, "ts": _ts()}
+    else:
+        msg = _persona_turn(chosen_persona, topic, messages, user_message or "")
     messages.append(msg)
 
-    return {"messages": messages, "extras": extras, "topic": topic}
+    # Pre-generate the likely next turn while the frontend plays this one back
+    if speculative and not _round_done(messages) and not any(x.get("type") == "helpline" for x in extras):
+        snapshot = list(messages)
+        _speculative.speculate(
+            state_key(session_id, topic, snapshot),
+            session_id,
+            lambda: _persona_turn(_next_persona(snapshot), topic, snapshot, ""),
+        )
 
+    return {"messages": messages, "extras": extras, "topic": topic}
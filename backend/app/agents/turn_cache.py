@@ -0,0 +1,97 @@
+# app/agents/turn_cache.py
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+import hashlib
+import json
+import threading
+import time
+
+
+def state_key(session_id: str, topic: str, history: List[Dict[str, Any]]) -> str:
+    """
+    Stable key for one session's conversation state. Only role/name/content
+    count; timestamps and typing delays differ between server and client copies.
+    """
+    convo = [(m.get("role"), m.get("name"), m.get("content")) for m in history]
+    raw = json.dumps([session_id, topic, convo], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class SpeculativeTurnCache:
+    """
+    Bounded, TTL-limited store of persona turns generated in the background.
+    Entries are taken at most once; anything evicted, expired, discarded or
+    not ready in time is counted as wasted. Speculation is skipped (and
+    counted) when every worker is already busy, rather than queued.
+    """
+
+    def __init__(self, max_entries: int = 64, ttl_seconds: float = 120.0,
+                 wait_seconds: float = 20.0, workers: int = 4):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.wait_seconds = wait_seconds
+        self.workers = workers
+        # key -> (created, session_id, future)
+        self._entries: "OrderedDict[str, Tuple[float, str, Future]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="speculative-turn")
+        self._stats = {"started": 0, "skipped": 0, "hits": 0, "misses": 0, "wasted": 0}
+
+    def _drop(self, fut: Future) -> None:
+        fut.cancel()
+        self._stats["wasted"] += 1
+
+    def _evict_expired(self) -> None:
+        now = time.monotonic()
+        for key in [k for k, (born, _, _) in self._entries.items() if now - born > self.ttl_seconds]:
+            self._drop(self._entries.pop(key)[2])
+
+    def speculate(self, key: str, session_id: str, generate: Callable[[], Dict[str, Any]]) -> None:
+        """Start generating the turn for `key` in the background (no-op if already pending)."""
+        with self._lock:
+            self._evict_expired()
+            if key in self._entries:
+                return
+            if sum(not fut.done() for _, _, fut in self._entries.values()) >= self.workers:
+                self._stats["skipped"] += 1  # would only queue behind other sessions
+                return
+            while len(self._entries) >= self.max_entries:
+                self._drop(self._entries.popitem(last=False)[1][2])
+            self._entries[key] = (time.monotonic(), session_id, self._pool.submit(generate))
+            self._stats["started"] += 1
+
+    def take(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Pop and return the speculative turn for `key`. A turn still being
+        generated is waited for, since it is always ahead of a fresh call.
+        None means miss.
+        """
+        with self._lock:
+            self._evict_expired()
+            entry = self._entries.pop(key, None)
+        result = None
+        timed_out = False
+        if entry is not None:
+            try:
+                result = entry[2].result(timeout=self.wait_seconds)
+            except TimeoutError:
+                timed_out = True
+            except Exception:
+                result = None
+        with self._lock:
+            self._stats["hits" if result is not None else "misses"] += 1
+            if timed_out:
+                self._drop(entry[2])
+        return result
+
+    def discard(self, session_id: str) -> None:
+        """Throw away every pending turn of a session, e.g. because the user interjected."""
+        with self._lock:
+            for key in [k for k, (_, sid, _) in self._entries.items() if sid == session_id]:
+                self._drop(self._entries.pop(key)[2])
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            self._evict_expired()
+            return {**self._stats, "pending": len(self._entries)}
@@ -1,7 +1,7 @@
 from fastapi import APIRouter
 from pydantic import BaseModel
 from typing import List
-from app.agents.chat_agent import orchestrate_turn
+from app.agents.chat_agent import orchestrate_turn, speculation_stats
 
 router = APIRouter()
 
@@ -9,7 +9,15 @@ class ChatInput(BaseModel):
     topic: str
     history: List[dict] = []
     user_message: str = ""
+    debate: bool = False  # roundtable playback; enables speculative next turns
+    session_id: str = ""  # scopes speculative turns to one debate
 
 @router.post("/respond")
 def respond(payload: ChatInput):
-    return orchestrate_turn(payload.topic, payload.history, payload.user_message)
+    return orchestrate_turn(payload.topic, payload.history, payload.user_message,
+                            payload.debate, payload.session_id)
+
+@router.get("/speculation")
+def speculation():
+    """Hit/miss/waste counters for speculative debate turns."""
+    return speculation_stats()
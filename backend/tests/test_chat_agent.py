@@ -0,0 +1,99 @@
+import pytest
+
+from app.agents import chat_agent
+from app.agents.chat_agent import PERSONA_ORDER, _next_persona, _round_done, orchestrate_turn
+from app.agents.turn_cache import SpeculativeTurnCache
+
+
+def _said(name):
+    return {"role": "assistant", "name": name, "content": f"{name} speaking"}
+
+
+def test_next_persona_rotates_through_order():
+    assert _next_persona([]) == PERSONA_ORDER[0]
+    assert _next_persona([_said("CBT")]) == "Holistic"
+    assert _next_persona([_said("Holistic")]) == "Analytical"
+    assert _next_persona([_said("Analytical")]) == "CBT"
+
+
+def test_next_persona_skips_user_and_support_messages():
+    history = [
+        _said("Holistic"),
+        {"role": "user", "name": "You", "content": "hi"},
+        {"role": "assistant", "name": "Support", "content": "..."},
+    ]
+    assert _next_persona(history) == "Analytical"
+
+
+def test_round_done_counts_turns_since_user_message():
+    assert not _round_done([_said("CBT"), _said("Holistic")])
+    assert _round_done([_said("CBT"), _said("Holistic"), _said("Analytical")])
+    history = [_said("CBT"), _said("Holistic"), _said("Analytical"),
+               {"role": "user", "name": "You", "content": "hi"}, _said("CBT")]
+    assert not _round_done(history)
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    fresh = SpeculativeTurnCache()
+    monkeypatch.setattr(chat_agent, "_speculative", fresh)
+    monkeypatch.setattr(chat_agent, "SPECULATIVE_TURNS", True)
+    monkeypatch.setattr(chat_agent, "_client", lambda: None)
+    return fresh
+
+
+def _debate(history, user_message="", session_id="s1"):
+    return orchestrate_turn("anxiety", history, user_message, debate=True, session_id=session_id)
+
+
+def test_debate_continuation_is_served_from_cache(cache):
+    first = _debate([])
+    second = _debate(first["messages"])
+    assert second["messages"][-1]["name"] == "Holistic"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 0)  # the opening is not a lookup
+
+
+def test_interjection_discards_pending_turns(cache):
+    first = _debate([])
+    second = _debate(first["messages"])
+    # the user only saw the opening when they typed
+    _debate(first["messages"], "why do I feel this way")
+    stats = cache.stats()
+    assert stats["wasted"] == 1
+    assert stats["pending"] == 1  # the turn following the interjection
+    assert second["messages"][-1]["name"] == "Holistic"
+
+
+def test_no_speculation_outside_debate(cache):
+    orchestrate_turn("Therapy Session", [], "I keep overthinking", debate=False)
+    orchestrate_turn("Therapy Session", [_said("CBT")], "", debate=False)
+    assert cache.stats() == {"started": 0, "skipped": 0, "hits": 0, "misses": 0, "wasted": 0, "pending": 0}
+
+
+def test_interjection_leaves_other_sessions_alone(cache):
+    first = _debate([], session_id="s1")
+    _debate([], session_id="s2")
+    _debate(first["messages"], "why do I feel this way", session_id="s1")
+    assert cache.stats()["wasted"] == 1
+    assert cache.stats()["pending"] == 2
+
+
+def test_no_speculation_once_round_is_done(cache):
+    history = _debate([])["messages"]
+    for _ in PERSONA_ORDER[1:]:
+        history = _debate(history)["messages"]
+    assert [m["name"] for m in history] == PERSONA_ORDER
+    assert cache.stats()["pending"] == 0
+
+
+def test_continuation_outside_debate_keeps_cbt_fallback(cache):
+    reply = orchestrate_turn("Therapy Session", [_said("CBT")], "")
+    assert reply["messages"][-1]["name"] == "CBT"
+
+
+def test_crisis_message_gets_helpline(cache):
+    reply = _debate([_said("CBT")], "I have been thinking about suicide")
+    assert reply["messages"][2]["name"] == "Support"
+    assert reply["extras"][0]["type"] == "helpline"
+    assert cache.stats()["started"] == 0
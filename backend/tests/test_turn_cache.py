@@ -0,0 +1,105 @@
+import threading
+import time
+
+from app.agents.turn_cache import SpeculativeTurnCache, state_key
+
+
+def _turn(name="CBT"):
+    return {"role": "assistant", "name": name, "content": "hello"}
+
+
+def test_state_key_ignores_timestamps():
+    a = [{"role": "assistant", "name": "CBT", "content": "hi", "ts": "1", "typing_ms": 1100}]
+    b = [{"role": "assistant", "name": "CBT", "content": "hi", "ts": "2"}]
+    assert state_key("s1", "anxiety", a) == state_key("s1", "anxiety", b)
+    assert state_key("s1", "anxiety", a) != state_key("s1", "digital", a)
+    assert state_key("s1", "anxiety", a) != state_key("s2", "anxiety", a)
+
+
+def test_hit_is_taken_once():
+    cache = SpeculativeTurnCache()
+    cache.speculate("k", "s", _turn)
+    assert cache.take("k") == _turn()
+    assert cache.take("k") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["wasted"], stats["pending"]) == (1, 1, 0, 0)
+
+
+def test_miss_for_unknown_key():
+    cache = SpeculativeTurnCache()
+    cache.speculate("k", "s", _turn)
+    assert cache.take("other") is None
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["pending"] == 1
+
+
+def test_discard_drops_whole_session():
+    cache = SpeculativeTurnCache()
+    cache.speculate("k1", "s", _turn)
+    cache.speculate("k2", "s", _turn)
+    cache.speculate("k3", "other", _turn)
+    cache.discard("s")
+    assert cache.take("k1") is None
+    stats = cache.stats()
+    assert stats["wasted"] == 2
+    assert stats["pending"] == 1
+
+
+def test_ttl_expiry_counts_as_wasted():
+    cache = SpeculativeTurnCache(ttl_seconds=0.05)
+    cache.speculate("k", "s", _turn)
+    time.sleep(0.1)
+    assert cache.take("k") is None
+    stats = cache.stats()
+    assert (stats["misses"], stats["wasted"], stats["pending"]) == (1, 1, 0)
+
+
+def test_max_entries_evicts_oldest():
+    cache = SpeculativeTurnCache(max_entries=2, workers=4)
+    for key in ("k1", "k2", "k3"):
+        cache.speculate(key, "s", _turn)
+    assert cache.stats()["wasted"] == 1
+    assert cache.take("k1") is None
+    assert cache.take("k3") == _turn()
+
+
+def test_slow_generation_is_still_a_hit():
+    def slow():
+        time.sleep(0.2)
+        return _turn()
+
+    cache = SpeculativeTurnCache()
+    cache.speculate("k", "s", slow)
+    assert cache.take("k") == _turn()  # waited for, not regenerated
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["wasted"]) == (1, 0, 0)
+
+
+def test_generation_past_wait_limit_is_wasted():
+    release = threading.Event()
+
+    def stuck():
+        release.wait(2)
+        return _turn()
+
+    cache = SpeculativeTurnCache(wait_seconds=0.05)
+    cache.speculate("k", "s", stuck)
+    assert cache.take("k") is None
+    release.set()
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["wasted"]) == (0, 1, 1)
+
+
+def test_speculation_skipped_when_workers_busy():
+    release = threading.Event()
+
+    def stuck():
+        release.wait(2)
+        return _turn()
+
+    cache = SpeculativeTurnCache(workers=1)
+    cache.speculate("k1", "s", stuck)
+    cache.speculate("k2", "s", _turn)
+    release.set()
+    stats = cache.stats()
+    assert (stats["started"], stats["skipped"], stats["pending"]) == (1, 1, 1)
@@ -9,6 +9,17 @@ const PERSONAS = {
   Analytical: { avatar: "🔍", color: "bg-yellow-100", label: "Dr. Maria Rodriguez (Analytical)" },
 }
 
+// Auto-play one round (a turn per persona) after the opening or each user message
+const ROUND = Object.keys(PERSONAS).length
+
+function roundDone(messages) {
+  let turns = 0
+  for (let i = messages.length - 1; i >= 0 && messages[i].role !== "user"; i--) {
+    if (PERSONAS[messages[i].name]) turns++
+  }
+  return turns >= ROUND
+}
+
 const TOPICS = [
   { id: "anxiety",     title: "Best Approaches for Treating Anxiety" },
   { id: "digital",     title: "Digital Therapy vs Traditional Sessions" },
@@ -25,6 +36,13 @@ export default function RoundtableChat() {
   const [speed, setSpeed] = useState(1)               // 1, 1.5, 2
   const [userMsg, setUserMsg] = useState("")
   const [extras, setExtras] = useState([])            // wellness / helpline cards
+  const historyRef = useRef([])                        // latest history for the playback loop
+  const latestPlan = useRef(0)                         // id of the newest /chat/respond call
+  const inFlight = useRef(0)                           // pending /chat/respond calls
+  const autoContinue = useRef(true)                    // keep the debate going after playback
+  const sessionId = useRef("")                         // scopes the backend's speculative turns
+
+  useEffect(() => { historyRef.current = history }, [history])
 
   const recognition = ('webkitSpeechRecognition' in window) ? new webkitSpeechRecognition() : null
   if (recognition) {
@@ -33,35 +51,54 @@ export default function RoundtableChat() {
   }
 
   // Generate a “turn plan” from backend whenever topic changes (or when user interjects)
-  async function fetchPlan(userText = "") {
+  // `context` is the history the reply should continue from (defaults to what has been shown).
+  async function fetchPlan(userText = "", context = historyRef.current) {
     const payload = {
       topic,
-      history,           // send full context so backend can “continue”
+      history: context,  // send full context so backend can “continue”
       user_message: userText || "",
+      debate: true,      // lets the backend pre-generate the next persona's turn
+      session_id: sessionId.current,
+    }
+    const planId = ++latestPlan.current
+    inFlight.current += 1
+    try {
+      const r = await fetch(`${API}/chat/respond`, {
+        method: "POST",
+        headers: {"Content-Type":"application/json"},
+        body: JSON.stringify(payload)
+      })
+      const data = await r.json()
+      if (planId !== latestPlan.current) return  // topic changed or user interjected meanwhile
+      // data.messages: [{role, name, content, ts, typing_ms?}, ...]
+      // data.extras: wellness/helpline cards
+      // We’ll enqueue only **new** AI messages; user message is already added locally.
+      const newAI = (data.messages || []).slice(context.length).filter(m => m.role !== "user")
+      setQueue(q => [...q, ...newAI])
+      if (userText) {
+        setExtras(data.extras || [])
+        // after a crisis reply, don't carry on debating over the helpline message
+        autoContinue.current = !(data.extras || []).some(x => x.type === "helpline")
+      }
+    } finally {
+      inFlight.current -= 1
     }
-    const r = await fetch(`${API}/chat/respond`, {
-      method: "POST",
-      headers: {"Content-Type":"application/json"},
-      body: JSON.stringify(payload)
-    })
-    const data = await r.json()
-    // data.messages: [{role, name, content, ts, typing_ms?}, ...]
-    // data.extras: wellness/helpline cards
-    // We’ll enqueue only **new** AI messages; user message is already added locally.
-    const newAI = (data.messages || []).filter(m => m.role !== "user")
-    setQueue(q => [...q, ...newAI])
-    setExtras(data.extras || [])
   }
 
   // When topic changes, reset and load opening round
   useEffect(() => {
+    historyRef.current = []
+    autoContinue.current = true
+    sessionId.current = crypto.randomUUID()
     setHistory([])
     setQueue([])
     setExtras([])
-    fetchPlan("")  // opening volley from the 3 personas
+    fetchPlan("", [])  // opening volley from the 3 personas
   }, [topic])
 
-  // Playback loop: pop from queue with typing delay; allow pause/resume & speed
+  // Playback loop: pop from queue with typing delay; allow pause/resume & speed.
+  // When the last queued turn is shown, ask for the next one until the round is
+  // done; the backend has usually pre-generated it, so it comes back at once.
   useEffect(() => {
     if (!isPlaying || queue.length === 0) return
     let canceled = false
@@ -70,8 +107,13 @@ export default function RoundtableChat() {
     const delay = Math.max(300, (next.typing_ms || 1200) / speed)
     const t = setTimeout(() => {
       if (canceled) return
-      setHistory(h => [...h, next])
+      const shown = [...historyRef.current, next]
+      historyRef.current = shown
+      setHistory(shown)
       setQueue(q => q.slice(1))
+      if (queue.length === 1 && inFlight.current === 0 && autoContinue.current && !roundDone(shown)) {
+        fetchPlan("", shown)
+      }
     }, delay)
 
     return () => { canceled = true; clearTimeout(t) }
@@ -83,10 +125,14 @@ export default function RoundtableChat() {
     if (!text) return
     const ts = new Date().toISOString()
     const userMessage = { role:"user", name:"You", content:text, ts }
-    setHistory(h => [...h, userMessage])
+    // show any turns still queued first, so our history matches the server's
+    const context = [...historyRef.current, ...queue]
+    historyRef.current = [...context, userMessage]
+    setHistory(historyRef.current)
+    setQueue([])
     setUserMsg("")
     // ask backend for the next AI turns in response
-    fetchPlan(text)
+    fetchPlan(text, context)
   }
 
   // export helpers